@@ -16,9 +16,15 @@ WORKSPACE_DIR = os.getenv("WORKSPACE_DIR", "")
 # Claude Code CLI
 CLAUDE_BIN = os.getenv("CLAUDE_BIN", "claude")
 CLAUDE_TIMEOUT = int(os.getenv("CLAUDE_TIMEOUT", "300"))  # 5 minutes
+MAX_CONCURRENT_TASKS = int(os.getenv("MAX_CONCURRENT_TASKS", "3"))
 
 # Slack
 SLACK_BOT_TOKEN = os.getenv("SLACK_BOT_TOKEN", "")
 
 # Polling
 POLL_INTERVAL = int(os.getenv("POLL_INTERVAL", "5"))  # seconds
+
+# GitHub webhook (optional — event-driven task pickup instead of fast polling)
+WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", "0"))  # 0 = disabled
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET", "")  # GitHub webhook secret
+WEBHOOK_FALLBACK_INTERVAL = int(os.getenv("WEBHOOK_FALLBACK_INTERVAL", "300"))  # seconds
@@ -1,9 +1,13 @@
 """
 Claude Code Slack — Local Daemon
 
-Polls GitHub for task files, executes them via Claude Code CLI,
+Picks up task files from GitHub, executes them via Claude Code CLI,
 and posts results back to Slack.
 
+Tasks arrive either via a GitHub push webhook (if WEBHOOK_PORT is set)
+or by polling the tasks/ directory. With the webhook enabled, polling
+drops to a slow fallback scan that recovers any missed events.
+
 Runs as a macOS LaunchAgent on your local machine.
 """
 
@@ -11,12 +15,17 @@ from __future__ import annotations
 
 import asyncio
 import base64
+import hashlib
+import hmac
+import io
 import json
 import logging
 import os
 import re
 import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from dotenv import load_dotenv
 
@@ -24,6 +33,8 @@ from dotenv import load_dotenv
 load_dotenv(os.path.join(os.path.dirname(__file__), ".env"))
 
 import httpx
+import orjson
+from aiohttp import web
 
 import config
 
@@ -35,6 +46,21 @@ logger = logging.getLogger("claude-code-slack.daemon")
 
 GITHUB_API = "https://api.github.com"
 
+# Shared keep-alive HTTP client — one TLS handshake, reused for every
+# GitHub and Slack call instead of a fresh client per request.
+_client: httpx.AsyncClient | None = None
+
+
+def get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=True,
+            timeout=30,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=40),
+        )
+    return _client
+
 
 def github_headers() -> dict:
     return {
@@ -44,46 +70,226 @@ def github_headers() -> dict:
     }
 
 
+# --- ETag Cache ---
+
+# Conditional-request cache: key -> (etag, parsed body). GitHub answers
+# unchanged resources with a 304 (no body, no rate-limit cost), which makes
+# idle polls essentially free. Persisted so restarts don't lose the etags.
+_ETAG_CACHE_FILE = os.path.expanduser("~/.cache/claude-code-slack/etags.json")
+# Tree URLs are content-addressed and task files are one-shot, so most
+# keys go stale after a single push; cap the cache and evict oldest-first
+# (dict insertion order) instead of letting it grow for the install's life.
+_ETAG_CACHE_MAX = 256
+_etag_cache: dict[str, tuple[str, object]] = {}
+_etag_cache_dirty = False
+
+
+def _cache_put(key: str, etag: str, data: object):
+    global _etag_cache_dirty
+    _etag_cache.pop(key, None)  # re-insert so live keys stay newest
+    _etag_cache[key] = (etag, data)
+    while len(_etag_cache) > _ETAG_CACHE_MAX:
+        _etag_cache.pop(next(iter(_etag_cache)))
+    _etag_cache_dirty = True
+
+
+def _cache_evict(key: str):
+    global _etag_cache_dirty
+    if _etag_cache.pop(key, None) is not None:
+        _etag_cache_dirty = True
+
+
+def _load_etag_cache():
+    try:
+        with open(_ETAG_CACHE_FILE) as f:
+            _etag_cache.update({k: (v[0], v[1]) for k, v in json.load(f).items()})
+    except (OSError, ValueError):
+        pass  # no cache yet, or corrupt — start fresh
+
+
+def _save_etag_cache():
+    """Write the cache to disk. Blocking — run off the event loop."""
+    global _etag_cache_dirty
+    try:
+        os.makedirs(os.path.dirname(_ETAG_CACHE_FILE), exist_ok=True)
+        with open(_ETAG_CACHE_FILE, "w") as f:
+            json.dump({k: list(v) for k, v in _etag_cache.items()}, f)
+        _etag_cache_dirty = False
+    except OSError as e:
+        logger.warning(f"Could not persist etag cache: {e}")
+
+
+async def _conditional_get(client: httpx.AsyncClient, url: str, params: dict | None = None):
+    """GET a GitHub URL with If-None-Match. Returns (status_code, parsed JSON).
+
+    A 304 is translated to (200, cached body) so callers never see it.
+    """
+    key = url
+    if params:
+        key += "?" + "&".join(f"{k}={v}" for k, v in sorted(params.items()))
+
+    headers = github_headers()
+    cached = _etag_cache.get(key)
+    if cached:
+        headers["If-None-Match"] = cached[0]
+
+    resp = await client.get(url, headers=headers, params=params)
+
+    if resp.status_code == 304 and cached:
+        return 200, cached[1]
+    if resp.status_code == 200:
+        data = resp.json()
+        etag = resp.headers.get("ETag")
+        if etag:
+            _cache_put(key, etag, data)
+        return 200, data
+    return resp.status_code, None
+
+
+_load_etag_cache()
+
+
 # --- GitHub Task Queue ---
 
 
+# Tree URLs from the previous listing — content-addressed, so once the
+# branch moves they are never queried again and get evicted outright.
+_last_tree_urls: list[str] = []
+
+
 async def list_pending_tasks() -> list[dict]:
-    """List task files in the tasks/ directory on GitHub."""
-    url = f"{GITHUB_API}/repos/{config.GITHUB_REPO}/contents/{config.TASKS_PATH}"
-    params = {"ref": config.GITHUB_BRANCH}
+    """List task files in the tasks/ directory on GitHub.
+
+    Uses the branch + git-trees API instead of the contents API: tree
+    listings return just {path, sha} per entry, and every step here is
+    ETag-cached, so an idle poll is a handful of free 304s.
+    """
+    client = get_client()
+    repo = config.GITHUB_REPO
+
+    # Branch -> commit tree SHA (ETag-cached; 304 when nothing was pushed)
+    url = f"{GITHUB_API}/repos/{repo}/branches/{config.GITHUB_BRANCH}"
+    status, branch = await _conditional_get(client, url)
+    if status != 200 or branch is None:
+        if status != 404:
+            logger.error(f"GitHub branch lookup error: {status}")
+        return []
+
+    # Root tree -> tasks/ subtree SHA (tree URLs are content-addressed,
+    # so the cache hits whenever the SHA is unchanged)
+    tree_sha = branch["commit"]["commit"]["tree"]["sha"]
+    url = f"{GITHUB_API}/repos/{repo}/git/trees/{tree_sha}"
+    status, root = await _conditional_get(client, url)
+    if status != 200 or root is None:
+        logger.error(f"GitHub tree error: {status}")
+        return []
+
+    tasks_sha = next(
+        (
+            e["sha"]
+            for e in root.get("tree", [])
+            if e["path"] == config.TASKS_PATH and e["type"] == "tree"
+        ),
+        None,
+    )
+    if tasks_sha is None:
+        return []  # no tasks directory yet
+
+    url = f"{GITHUB_API}/repos/{repo}/git/trees/{tasks_sha}"
+    status, subtree = await _conditional_get(client, url)
+    if status != 200 or subtree is None:
+        logger.error(f"GitHub tree error: {status}")
+        return []
 
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(url, headers=github_headers(), params=params)
+    # Branch moved: the previous push's tree entries are dead weight now
+    tree_urls = [
+        f"{GITHUB_API}/repos/{repo}/git/trees/{tree_sha}",
+        url,
+    ]
+    for stale in _last_tree_urls:
+        if stale not in tree_urls:
+            _cache_evict(stale)
+    _last_tree_urls[:] = tree_urls
 
-        if resp.status_code == 404:
-            return []  # no tasks directory yet
+    # Only pick up .json files (skip .gitkeep, etc.)
+    return [
+        {
+            "name": e["path"],
+            "sha": e["sha"],
+            "path": f"{config.TASKS_PATH}/{e['path']}",
+        }
+        for e in subtree.get("tree", [])
+        if e["type"] == "blob" and e["path"].endswith(".json")
+    ]
+
+
+GITHUB_GRAPHQL = "https://api.github.com/graphql"
+
+# Aliases per GraphQL query — keeps each request comfortably under
+# GitHub's node limits.
+_GRAPHQL_BATCH_SIZE = 20
+
+
+async def read_tasks_batch(items: list[dict]) -> list[dict]:
+    """Read several task files from GitHub in batched GraphQL queries.
+
+    One aliased query fetches up to 20 blobs at once, collapsing the
+    N serial contents-API round trips into ceil(N/20) requests.
+    """
+    owner, _, name = config.GITHUB_REPO.partition("/")
+    tasks = []
+
+    for start in range(0, len(items), _GRAPHQL_BATCH_SIZE):
+        batch = items[start : start + _GRAPHQL_BATCH_SIZE]
+        fields = " ".join(
+            f'f{i}: object(expression: "{config.GITHUB_BRANCH}:{item["path"]}") '
+            "{ ... on Blob { text oid } }"
+            for i, item in enumerate(batch)
+        )
+        query = f'query {{ repository(owner: "{owner}", name: "{name}") {{ {fields} }} }}'
+
+        resp = await get_client().post(
+            GITHUB_GRAPHQL, headers=github_headers(), json={"query": query}
+        )
         if resp.status_code != 200:
-            logger.error(f"GitHub list error: {resp.status_code}")
-            return []
+            logger.error(f"GitHub GraphQL error: {resp.status_code}")
+            # Fall back to per-file reads for this batch
+            for item in batch:
+                task = await read_task(item["path"])
+                if task:
+                    tasks.append(task)
+            continue
 
-        items = resp.json()
-        if not isinstance(items, list):
-            return []
+        repository = (resp.json().get("data") or {}).get("repository") or {}
+        for i, item in enumerate(batch):
+            blob = repository.get(f"f{i}")
+            if not blob or blob.get("text") is None:
+                continue  # deleted since listing, or not a blob
+            try:
+                task = orjson.loads(blob["text"])
+            except ValueError:
+                logger.error(f"Invalid task JSON: {item['path']}")
+                continue
+            task["_sha"] = blob["oid"]
+            task["_path"] = item["path"]
+            tasks.append(task)
 
-        # Only pick up .json files (skip .gitkeep, etc.)
-        return [item for item in items if item["name"].endswith(".json")]
+    return tasks
 
 
 async def read_task(path: str) -> dict | None:
     """Read a task file from GitHub."""
     url = f"{GITHUB_API}/repos/{config.GITHUB_REPO}/contents/{path}"
 
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(url, headers=github_headers())
-        if resp.status_code != 200:
-            return None
+    status, data = await _conditional_get(get_client(), url)
+    if status != 200 or data is None:
+        return None
 
-        data = resp.json()
-        content = base64.b64decode(data["content"]).decode("utf-8")
-        task = json.loads(content)
-        task["_sha"] = data["sha"]
-        task["_path"] = path
-        return task
+    # orjson parses the decoded bytes directly — no intermediate str
+    task = orjson.loads(base64.b64decode(data["content"]))
+    task["_sha"] = data["sha"]
+    task["_path"] = path
+    return task
 
 
 async def delete_task(path: str, sha: str):
@@ -95,14 +301,15 @@ async def delete_task(path: str, sha: str):
         "branch": config.GITHUB_BRANCH,
     }
 
-    async with httpx.AsyncClient() as client:
-        resp = await client.request(
-            "DELETE", url, headers=github_headers(), json=payload
-        )
-        if resp.status_code in (200, 204):
-            logger.info(f"Deleted task: {path}")
-        else:
-            logger.error(f"Failed to delete task: {resp.status_code}")
+    resp = await get_client().request(
+        "DELETE", url, headers=github_headers(), json=payload
+    )
+    if resp.status_code in (200, 204):
+        # Task files are read at most once — drop any cached read of it
+        _cache_evict(url)
+        logger.info(f"Deleted task: {path}")
+    else:
+        logger.error(f"Failed to delete task: {resp.status_code}")
 
 
 # --- Claude Code Execution ---
@@ -117,10 +324,13 @@ PROMPT_PREFIX = (
 )
 
 
-def run_claude(prompt: str, context: str = "") -> str:
+async def run_claude(prompt: str, context: str = "") -> str:
     """
     Run Claude Code CLI with a prompt in the workspace directory.
     Uses the local Claude subscription — no API key needed.
+
+    Runs as a native asyncio subprocess, so no executor thread is held
+    for the (up to CLAUDE_TIMEOUT) duration of the run.
     """
     if context:
         full_prompt = PROMPT_PREFIX + context + "\nLatest request: " + prompt
@@ -129,28 +339,67 @@ def run_claude(prompt: str, context: str = "") -> str:
     logger.info(f"Running Claude Code: {prompt[:80]}...")
 
     try:
-        result = subprocess.run(
-            [config.CLAUDE_BIN, "-p", full_prompt],
+        proc = await asyncio.create_subprocess_exec(
+            config.CLAUDE_BIN,
+            "-p",
+            full_prompt,
             cwd=config.WORKSPACE_DIR,
-            capture_output=True,
-            text=True,
-            timeout=config.CLAUDE_TIMEOUT,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
         )
-
-        if result.returncode == 0:
-            return result.stdout.strip()
-        else:
-            logger.error(f"Claude exited {result.returncode}: {result.stderr}")
-            return f"Error: Claude Code returned exit code {result.returncode}\n{result.stderr[:500]}"
-
-    except subprocess.TimeoutExpired:
-        return f"Error: Claude Code timed out ({config.CLAUDE_TIMEOUT}s limit)"
     except FileNotFoundError:
         return "Error: Claude Code CLI not found. Is it installed and in PATH?"
 
+    try:
+        stdout, stderr = await asyncio.wait_for(
+            proc.communicate(), timeout=config.CLAUDE_TIMEOUT
+        )
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return f"Error: Claude Code timed out ({config.CLAUDE_TIMEOUT}s limit)"
+
+    if proc.returncode == 0:
+        return stdout.decode().strip()
+
+    stderr_text = stderr.decode()
+    logger.error(f"Claude exited {proc.returncode}: {stderr_text}")
+    return f"Error: Claude Code returned exit code {proc.returncode}\n{stderr_text[:500]}"
+
 
 # --- Markdown to Slack Conversion ---
 
+# Compiled once at import — markdown_to_slack runs these per line on
+# every Claude reply
+_RE_FENCE = re.compile(r"(```[\s\S]*?```)")
+_RE_HEADER = re.compile(r"^(#{1,6})\s+(.+)$")
+_RE_HR = re.compile(r"^---+$")
+_RE_BULLET = re.compile(r"^(\s*)\*\s+(.+)$")
+_RE_MENTION = re.compile(r"<@[A-Z0-9]+>\s*")
+
+# All inline markup in one alternation so each line is scanned once.
+# Order matters: *** before **, and ![..](..) before [..](..).
+_RE_INLINE = re.compile(
+    r"\*\*\*(?P<bi>.+?)\*\*\*"
+    r"|\*\*(?P<b>.+?)\*\*"
+    r"|!\[(?P<img_alt>[^\]]*)\]\((?P<img_url>[^)]+)\)"
+    r"|\[(?P<link_text>[^\]]+)\]\((?P<link_url>[^)]+)\)"
+    r"|~~(?P<strike>.+?)~~"
+)
+
+
+def _inline_to_slack(m: re.Match) -> str:
+    """Render whichever inline-markup alternative matched as Slack mrkdwn."""
+    if m.group("bi") is not None:
+        return f"*_{m.group('bi')}_*"
+    if m.group("b") is not None:
+        return f"*{m.group('b')}*"
+    if m.group("img_alt") is not None:
+        return f"<{m.group('img_url')}|{m.group('img_alt')}>"
+    if m.group("link_text") is not None:
+        return f"<{m.group('link_url')}|{m.group('link_text')}>"
+    return f"~{m.group('strike')}~"
+
 
 def markdown_to_slack(text: str) -> str:
     """Convert standard markdown to Slack mrkdwn format.
@@ -165,58 +414,66 @@ def markdown_to_slack(text: str) -> str:
       - No headings — use *bold* as a substitute
     """
     # Protect fenced code blocks from transformation
-    parts = re.split(r"(```[\s\S]*?```)", text)
-    converted = []
+    parts = _RE_FENCE.split(text)
+    out = io.StringIO()
 
     for i, part in enumerate(parts):
         if i % 2 == 1:
             # Inside a fenced code block — leave as-is
-            converted.append(part)
+            out.write(part)
             continue
 
-        lines = part.split("\n")
-        result = []
+        for j, line in enumerate(part.split("\n")):
+            if j:
+                out.write("\n")
+
+            stripped = line.lstrip()
 
-        for line in lines:
             # Headers: ## Title -> *Title*
-            header_match = re.match(r"^(#{1,6})\s+(.+)$", line)
-            if header_match:
-                result.append(f"*{header_match.group(2)}*")
-                continue
+            if stripped.startswith("#"):
+                header_match = _RE_HEADER.match(line)
+                if header_match:
+                    out.write(f"*{header_match.group(2)}*")
+                    continue
 
             # Horizontal rules -> empty line
-            if re.match(r"^---+$", line.strip()):
-                result.append("")
+            if stripped.startswith("---") and _RE_HR.match(line.strip()):
                 continue
 
-            # Bold+italic: ***text*** -> *_text_*
-            line = re.sub(r"\*\*\*(.+?)\*\*\*", r"*_\1_*", line)
-
-            # Bold: **text** -> *text*
-            line = re.sub(r"\*\*(.+?)\*\*", r"*\1*", line)
+            # Bullet list markers: convert * bullets to dot (avoid bold confusion)
+            if stripped.startswith("*"):
+                bullet_match = _RE_BULLET.match(line)
+                if bullet_match:
+                    line = f"{bullet_match.group(1)}• {bullet_match.group(2)}"
 
-            # Links: [text](url) -> <url|text>
-            line = re.sub(r"\[([^\]]+)\]\(([^)]+)\)", r"<\2|\1>", line)
+            # All remaining inline markup in one pass
+            out.write(_RE_INLINE.sub(_inline_to_slack, line))
 
-            # Images: ![alt](url) -> <url|alt>
-            line = re.sub(r"!\[([^\]]*)\]\(([^)]+)\)", r"<\2|\1>", line)
+    return out.getvalue()
 
-            # Strikethrough: ~~text~~ -> ~text~
-            line = re.sub(r"~~(.+?)~~", r"~\1~", line)
 
-            # Bullet list markers: convert * bullets to dot (avoid bold confusion)
-            bullet_match = re.match(r"^(\s*)\*\s+(.+)$", line)
-            if bullet_match:
-                line = f"{bullet_match.group(1)}• {bullet_match.group(2)}"
+# --- Slack Communication ---
 
-            result.append(line)
 
-        converted.append("\n".join(result))
+async def _slack_api(
+    method: str, payload: dict | None = None, params: dict | None = None
+) -> dict:
+    """Call a Slack Web API method on the shared client. Returns parsed JSON.
 
-    return "".join(converted)
+    POSTs `payload` as JSON when given, otherwise GETs with `params`.
+    """
+    url = f"https://slack.com/api/{method}"
+    headers = {"Authorization": f"Bearer {config.SLACK_BOT_TOKEN}"}
 
+    if payload is not None:
+        resp = await get_client().post(url, headers=headers, json=payload)
+    else:
+        resp = await get_client().get(url, headers=headers, params=params)
 
-# --- Slack Communication ---
+    data = resp.json()
+    if not data.get("ok"):
+        logger.error(f"Slack {method} error: {data.get('error')}")
+    return data
 
 
 async def post_to_slack(channel: str, text: str, thread_ts: str = ""):
@@ -229,24 +486,15 @@ async def post_to_slack(channel: str, text: str, thread_ts: str = ""):
     if thread_ts:
         payload["thread_ts"] = thread_ts
 
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(
-            "https://slack.com/api/chat.postMessage",
-            headers={"Authorization": f"Bearer {config.SLACK_BOT_TOKEN}"},
-            json=payload,
-        )
-        data = resp.json()
-        if not data.get("ok"):
-            logger.error(f"Slack error: {data.get('error')}")
+    await _slack_api("chat.postMessage", payload=payload)
 
 
 async def respond_via_url(response_url: str, text: str):
     """Respond to a slash command via response_url."""
-    async with httpx.AsyncClient() as client:
-        await client.post(
-            response_url,
-            json={"response_type": "in_channel", "text": text},
-        )
+    await get_client().post(
+        response_url,
+        json={"response_type": "in_channel", "text": text},
+    )
 
 
 # --- Thread Context ---
@@ -257,18 +505,10 @@ async def fetch_thread_history(channel: str, thread_ts: str) -> list[dict]:
     if not config.SLACK_BOT_TOKEN:
         return []
 
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(
-            "https://slack.com/api/conversations.replies",
-            headers={"Authorization": f"Bearer {config.SLACK_BOT_TOKEN}"},
-            params={"channel": channel, "ts": thread_ts},
-        )
-        data = resp.json()
-        if data.get("ok"):
-            return data.get("messages", [])
-        else:
-            logger.error(f"Failed to fetch thread: {data.get('error')}")
-            return []
+    data = await _slack_api(
+        "conversations.replies", params={"channel": channel, "ts": thread_ts}
+    )
+    return data.get("messages", [])
 
 
 def format_thread_context(messages: list[dict]) -> str:
@@ -285,7 +525,7 @@ def format_thread_context(messages: list[dict]) -> str:
     for msg in messages[:-1]:  # Exclude the latest message (current request)
         text = msg.get("text", "")
         # Strip bot mentions from text
-        text = re.sub(r"<@[A-Z0-9]+>\s*", "", text).strip()
+        text = _RE_MENTION.sub("", text).strip()
         if not text:
             continue
 
@@ -302,6 +542,31 @@ def format_thread_context(messages: list[dict]) -> str:
 
 # --- Task Processing ---
 
+# Each running task holds a Claude CLI subprocess, so cap the fan-out
+_task_sem = asyncio.Semaphore(config.MAX_CONCURRENT_TASKS)
+
+
+async def _process_task_guarded(task: dict):
+    """process_task bounded by the concurrency semaphore."""
+    async with _task_sem:
+        await process_task(task)
+
+
+async def _process_batch(tasks: list[dict]):
+    """Run a batch of tasks concurrently, containing per-task failures.
+
+    return_exceptions keeps one failing task from unwinding the gather
+    while its siblings are still in flight — the next poll would re-list
+    their still-present task files and process them a second time.
+    """
+    results = await asyncio.gather(
+        *(_process_task_guarded(t) for t in tasks), return_exceptions=True
+    )
+    for task, result in zip(tasks, results):
+        if isinstance(result, BaseException):
+            task_id = task.get("task_id", task.get("_path", "unknown"))
+            logger.error(f"Task {task_id} failed: {result}", exc_info=result)
+
 
 async def process_task(task: dict):
     """Execute a single task."""
@@ -313,33 +578,54 @@ async def process_task(task: dict):
 
     logger.info(f"Processing task {task_id}: {prompt[:60]}...")
 
-    # Acknowledge pickup immediately so user sees activity
+    # Acknowledge pickup immediately so user sees activity, overlapping
+    # the ack POST with the thread-history fetch (both Slack round trips)
     ack_text = f"Processing: `{prompt[:80]}`..."
     if response_url:
-        await respond_via_url(response_url, ack_text)
+        ack = respond_via_url(response_url, ack_text)
     elif channel_id:
-        await post_to_slack(channel_id, ack_text, thread_ts)
+        ack = post_to_slack(channel_id, ack_text, thread_ts)
+    else:
+        ack = None
+
+    # A thread-root task has no prior conversation — the only message in
+    # the thread is the request itself, so skip the replies fetch
+    history = (
+        fetch_thread_history(channel_id, thread_ts)
+        if thread_ts and channel_id and not task.get("is_thread_root")
+        else None
+    )
+
+    messages: list[dict] = []
+    if ack and history:
+        _, messages = await asyncio.gather(ack, history)
+    elif ack:
+        await ack
+    elif history:
+        messages = await history
 
-    # Fetch thread context if this is a threaded conversation
-    context = ""
-    if thread_ts and channel_id:
-        messages = await fetch_thread_history(channel_id, thread_ts)
-        context = format_thread_context(messages)
-        if context:
-            logger.info(f"Thread context: {len(messages)} messages")
+    context = format_thread_context(messages) if messages else ""
+    if context:
+        logger.info(f"Thread context: {len(messages)} messages")
 
     # Run Claude Code CLI (with thread context if available)
-    output = await asyncio.get_running_loop().run_in_executor(
-        None, run_claude, prompt, context
-    )
+    output = await run_claude(prompt, context)
+
+    # Truncate for Slack (4000 char limit for a single message) before
+    # converting, so markdown_to_slack never scans text past the cutoff
+    if len(output) > 3900:
+        cut = output.rfind("\n", 0, 3900)
+        if cut == -1:
+            cut = 3900
+        output = output[:cut]
+        # Close a fence the cut may have opened so the marker stays visible
+        if output.count("```") % 2 == 1:
+            output += "\n```"
+        output += "\n...(truncated)"
 
     # Convert markdown to Slack mrkdwn format
     output = markdown_to_slack(output)
 
-    # Truncate for Slack (4000 char limit for a single message)
-    if len(output) > 3900:
-        output = output[:3900] + "\n...(truncated)"
-
     # Post result back to Slack (in thread if applicable)
     if response_url:
         await respond_via_url(response_url, output)
@@ -349,14 +635,27 @@ async def process_task(task: dict):
     # Delete the task file
     await delete_task(task["_path"], task["_sha"])
 
-    # Sync workspace changes to GitHub
-    await sync_workspace_to_github()
+    # Sync workspace changes to GitHub — skipped when Claude didn't touch
+    # any files (pure Q&A tasks), saving the whole commit+push chain.
+    # Status check and sync stay under one lock acquisition so the gate
+    # decides on the same tree state the sync then commits.
+    async with _git_lock:
+        rc, out = await asyncio.get_running_loop().run_in_executor(
+            None, _run_git, "status", "--porcelain"
+        )
+        if rc != 0 or out:
+            await sync_workspace_to_github()
 
     logger.info(f"Task {task_id} completed")
 
 
 # --- Git Sync ---
 
+# Tasks run concurrently but share one WORKSPACE_DIR — serialize every
+# git mutation (add/commit/push/pull) so parallel finishers don't fight
+# over the index or rebase across each other's in-progress edits
+_git_lock = asyncio.Lock()
+
 
 def _run_git(*args) -> tuple[int, str]:
     """Run a git command in the workspace directory. Returns (returncode, output)."""
@@ -383,15 +682,14 @@ async def sync_workspace_to_github():
         logger.warning(f"git add failed: {out}")
         return
 
-    # Check if there's anything to commit
-    rc, out = await loop.run_in_executor(None, _run_git, "diff", "--cached", "--quiet")
-    if rc == 0:
-        return  # Nothing staged, skip
-
+    # Commit directly — git's exit code tells us when nothing was staged,
+    # so no separate `diff --cached` spawn is needed
     rc, out = await loop.run_in_executor(
         None, _run_git, "commit", "-m", "auto: sync workspace changes from Slack"
     )
     if rc != 0:
+        if "nothing to commit" in out:
+            return  # Clean worktree, skip the push
         logger.warning(f"git commit failed: {out}")
         return
 
@@ -407,40 +705,179 @@ async def sync_workspace_to_github():
     logger.info("Synced workspace changes to GitHub")
 
 
+# Remote head after the last successful pull — lets git_pull skip the
+# network round trip when nothing was pushed in between
+_last_remote_sha = None
+
+
 async def git_pull():
-    """Pull latest changes from GitHub before processing tasks."""
+    """Pull latest changes from GitHub before processing tasks.
+
+    Checks the remote branch head first (rides the ETag cache already
+    primed by list_pending_tasks) and only pulls when it moved.
+    """
+    global _last_remote_sha
+
+    url = f"{GITHUB_API}/repos/{config.GITHUB_REPO}/branches/{config.GITHUB_BRANCH}"
+    status, branch = await _conditional_get(get_client(), url)
+    remote_sha = branch["commit"]["sha"] if status == 200 and branch else None
+
+    if remote_sha is not None and remote_sha == _last_remote_sha:
+        return  # remote unchanged since our last pull
+
     loop = asyncio.get_running_loop()
-    rc, out = await loop.run_in_executor(None, _run_git, "pull", "--rebase", "origin", config.GITHUB_BRANCH)
+    async with _git_lock:
+        rc, out = await loop.run_in_executor(None, _run_git, "pull", "--rebase", "origin", config.GITHUB_BRANCH)
     if rc != 0:
         logger.warning(f"git pull failed: {out}")
+        return
+
+    _last_remote_sha = remote_sha
+
+
+# --- GitHub Webhook ---
+
+# Task paths delivered by push events, consumed by the main loop
+_task_queue: asyncio.Queue = asyncio.Queue()
+
+
+def _verify_webhook_signature(body: bytes, signature: str) -> bool:
+    """Verify a GitHub webhook payload signature (X-Hub-Signature-256)."""
+    if not config.WEBHOOK_SECRET:
+        return True  # no secret configured — accept everything
+    if not signature.startswith("sha256="):
+        return False
+    expected = hmac.new(
+        config.WEBHOOK_SECRET.encode(), body, hashlib.sha256
+    ).hexdigest()
+    return hmac.compare_digest(f"sha256={expected}", signature)
+
+
+async def handle_push_event(request: web.Request) -> web.Response:
+    """Handle a GitHub push webhook — enqueue any new task files."""
+    body = await request.read()
+
+    if not _verify_webhook_signature(
+        body, request.headers.get("X-Hub-Signature-256", "")
+    ):
+        return web.Response(status=401, text="invalid signature")
+
+    if request.headers.get("X-GitHub-Event", "") != "push":
+        return web.Response(text="ignored")
+
+    payload = json.loads(body)
+    if payload.get("ref") != f"refs/heads/{config.GITHUB_BRANCH}":
+        return web.Response(text="ignored")
+
+    for commit in payload.get("commits", []):
+        for path in commit.get("added", []) + commit.get("modified", []):
+            if path.startswith(f"{config.TASKS_PATH}/") and path.endswith(".json"):
+                _task_queue.put_nowait(path)
+                logger.info(f"Webhook: queued task {path}")
+
+    return web.Response(text="ok")
+
+
+async def start_webhook_server() -> bool:
+    """Start the webhook listener if WEBHOOK_PORT is set. Returns True if running."""
+    if not config.WEBHOOK_PORT:
+        return False
+
+    app = web.Application()
+    app.router.add_post("/webhook", handle_push_event)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "0.0.0.0", config.WEBHOOK_PORT)
+    await site.start()
+    logger.info(f"Webhook listener on port {config.WEBHOOK_PORT}")
+    return True
 
 
 # --- Main Loop ---
 
 
 async def poll_loop():
-    """Main polling loop."""
-    logger.info(f"Daemon started. Polling {config.GITHUB_REPO}/{config.TASKS_PATH} every {config.POLL_INTERVAL}s")
+    """Main loop: process webhook-delivered tasks, poll as fallback."""
+    # Concurrent tasks each occupy an executor thread while Claude runs
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=config.MAX_CONCURRENT_TASKS + 2)
+    )
+
+    webhook_active = await start_webhook_server()
+    interval = (
+        config.WEBHOOK_FALLBACK_INTERVAL if webhook_active else config.POLL_INTERVAL
+    )
+
+    logger.info(
+        f"Daemon started. Watching {config.GITHUB_REPO}/{config.TASKS_PATH} "
+        f"({'webhook + fallback scan' if webhook_active else 'polling'} every {interval}s)"
+    )
     logger.info(f"Workspace: {config.WORKSPACE_DIR}")
     logger.info(f"Claude binary: {config.CLAUDE_BIN}")
 
+    try:
+        await _run_forever(interval)
+    finally:
+        if _etag_cache_dirty:
+            _save_etag_cache()
+        if _client is not None:
+            await _client.aclose()
+
+
+async def _run_forever(interval: int):
+    # Idle backoff: each empty poll doubles the sleep (capped), any found
+    # task resets it — an idle daemon stops hammering GitHub every 5s
+    idle_ticks = 0
+    backoff_cap = max(60, interval)
+    last_cache_save = time.monotonic()
+
     while True:
+        found_work = False
         try:
+            # Webhook-delivered tasks first — lowest latency path
+            queued = []
+            while not _task_queue.empty():
+                queued.append(_task_queue.get_nowait())
+
+            if queued:
+                await git_pull()
+                # dedupe, keep order
+                items = [{"path": p} for p in dict.fromkeys(queued)]
+                tasks = await read_tasks_batch(items)
+                await _process_batch(tasks)
+
+            # Poll the tasks/ directory (recovers anything a webhook missed)
             pending = await list_pending_tasks()
 
             if pending:
                 # Pull latest before processing
                 await git_pull()
 
-            for item in pending:
-                task = await read_task(item["path"])
-                if task:
-                    await process_task(task)
+            tasks = await read_tasks_batch(pending)
+            await _process_batch(tasks)
+
+            found_work = bool(queued or pending)
 
         except Exception as e:
             logger.error(f"Poll error: {e}", exc_info=True)
 
-        await asyncio.sleep(config.POLL_INTERVAL)
+        # Persist new etags off the event loop, at most once a minute
+        if _etag_cache_dirty and time.monotonic() - last_cache_save >= 60:
+            await asyncio.get_running_loop().run_in_executor(None, _save_etag_cache)
+            last_cache_save = time.monotonic()
+
+        if found_work:
+            idle_ticks = 0
+        else:
+            idle_ticks = min(idle_ticks + 1, 5)
+        sleep_for = min(interval * (2 ** idle_ticks), backoff_cap) if idle_ticks else interval
+
+        # Sleep until the next poll, but wake immediately on a webhook event
+        try:
+            path = await asyncio.wait_for(_task_queue.get(), timeout=sleep_for)
+            _task_queue.put_nowait(path)
+        except asyncio.TimeoutError:
+            pass
 
 
 if __name__ == "__main__":
@@ -9,26 +9,47 @@ Red circle = daemon stopped
 """
 
 import os
+import select
 import subprocess
+import threading
+import time
+
+import psutil
 import rumps
 
 LOG_FILE = os.path.expanduser("~/Library/Logs/claude-code-slack-daemon.log")
 PLIST_LABEL = "com.claude-code-slack.daemon"
 POLL_SECONDS = 10
+HEARTBEAT_SECONDS = 60  # slow refresh when the kqueue watcher is active
+PID_CACHE_SECONDS = 2  # repeated menu clicks shouldn't re-scan processes
+
+_last_pid_check = 0.0
+_last_pid = None
 
 
 def get_daemon_pid():
-    """Check if the daemon is running. Returns PID or None."""
+    """Check if the daemon is running. Returns PID or None.
+
+    Scans the process table in-process via psutil instead of forking
+    pgrep; the result is cached briefly.
+    """
+    global _last_pid_check, _last_pid
+    now = time.time()
+    if now - _last_pid_check < PID_CACHE_SECONDS:
+        return _last_pid
+
+    pid = None
     try:
-        result = subprocess.run(
-            ["pgrep", "-f", "python3.*main\\.py"],
-            capture_output=True, text=True, timeout=5,
-        )
-        pids = result.stdout.strip().split("\n")
-        pids = [p for p in pids if p]
-        return pids[0] if pids else None
+        for proc in psutil.process_iter(["pid", "cmdline"]):
+            cmd = " ".join(proc.info["cmdline"] or [])
+            if "python" in cmd and "main.py" in cmd:
+                pid = str(proc.info["pid"])
+                break
     except Exception:
-        return None
+        pid = None
+
+    _last_pid_check, _last_pid = now, pid
+    return pid
 
 
 def get_last_log_line():
@@ -36,11 +57,13 @@ def get_last_log_line():
     if not os.path.exists(LOG_FILE):
         return "No log file found"
     try:
-        result = subprocess.run(
-            ["tail", "-1", LOG_FILE],
-            capture_output=True, text=True, timeout=5,
-        )
-        line = result.stdout.strip()
+        # Read just the tail of the file instead of forking `tail`
+        with open(LOG_FILE, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - 4096))
+            lines = f.read().splitlines()
+        line = lines[-1].decode("utf-8", "replace").strip() if lines else ""
         return line[:120] if line else "Log is empty"
     except Exception:
         return "Could not read log"
@@ -50,6 +73,8 @@ class StatusBarApp(rumps.App):
     def __init__(self):
         super().__init__("CCS", quit_button=None)
         self._dock_hidden = False
+        self._last_refresh = 0.0
+        self._log_dirty = threading.Event()
         self.pid = None
         self.update_status()
 
@@ -70,6 +95,10 @@ class StatusBarApp(rumps.App):
             self.quit_item,
         ]
 
+        # Start watching only once the menu items above exist — a log
+        # write before that would make the first refresh blow up
+        self._watching = self._start_log_watcher()
+
     def update_status(self):
         """Check daemon status and update the icon."""
         self.pid = get_daemon_pid()
@@ -78,9 +107,67 @@ class StatusBarApp(rumps.App):
         else:
             self.title = "\U0001F534"  # red circle
 
+    def _start_log_watcher(self):
+        """Watch the daemon log with kqueue so refreshes are event-driven.
+
+        Returns True when the watcher thread started (macOS/BSD). Without
+        kqueue the app falls back to plain timed polling.
+        """
+        if not hasattr(select, "kqueue"):
+            return False
+        threading.Thread(target=self._watch_log, daemon=True).start()
+        return True
+
+    def _watch_log(self):
+        """Background thread: block until the log file is written, then flag
+        the main thread to refresh.
+
+        AppKit is not thread-safe, so this thread never touches the UI —
+        it only sets `_log_dirty`, which the rumps timer drains on the
+        main thread.
+        """
+        rotate = select.KQ_NOTE_DELETE | select.KQ_NOTE_RENAME
+        while True:
+            try:
+                fd = os.open(LOG_FILE, os.O_RDONLY)
+            except OSError:
+                time.sleep(POLL_SECONDS)  # log not created yet
+                continue
+
+            kq = select.kqueue()
+            ev = select.kevent(
+                fd,
+                filter=select.KQ_FILTER_VNODE,
+                flags=select.KQ_EV_ADD | select.KQ_EV_CLEAR,
+                fflags=select.KQ_NOTE_WRITE | rotate,
+            )
+            try:
+                while True:
+                    events = kq.control([ev], 1, None)
+                    self._log_dirty.set()
+                    if any(e.fflags & rotate for e in events):
+                        break  # file rotated/replaced — reopen it
+            except OSError:
+                pass
+            finally:
+                kq.close()
+                os.close(fd)
+
+    def refresh(self):
+        """Update icon and menu items from current daemon state."""
+        self._last_refresh = time.time()
+        self.update_status()
+        if self.pid:
+            self.status_item.title = f"Running (PID {self.pid})"
+        else:
+            self.status_item.title = "Stopped"
+        self.log_item.title = f"Log: {get_last_log_line()}"
+
     @rumps.timer(POLL_SECONDS)
     def poll(self, _):
-        """Periodically check daemon status."""
+        """Periodic check — with the kqueue watcher active this only
+        refreshes when the watcher flagged a log write, plus a slow
+        heartbeat that catches a daemon dying without one."""
         if not self._dock_hidden:
             try:
                 from AppKit import NSApplication
@@ -88,33 +175,42 @@ class StatusBarApp(rumps.App):
                 self._dock_hidden = True
             except Exception:
                 pass
-        self.update_status()
-        if self.pid:
-            self.status_item.title = f"Running (PID {self.pid})"
-        else:
-            self.status_item.title = "Stopped"
-        self.log_item.title = f"Log: {get_last_log_line()}"
+        if (
+            self._watching
+            and not self._log_dirty.is_set()
+            and time.time() - self._last_refresh < HEARTBEAT_SECONDS
+        ):
+            return
+        self._log_dirty.clear()
+        self.refresh()
 
     @rumps.clicked("Restart Daemon")
     def restart(self, _):
         """Restart the daemon via launchctl."""
+        # kickstart reports failure via its exit code — but a hung
+        # launchctl raises TimeoutExpired, and both mean fall back
         try:
-            subprocess.run(
+            result = subprocess.run(
                 ["launchctl", "kickstart", "-k", f"gui/{os.getuid()}/{PLIST_LABEL}"],
                 capture_output=True, timeout=10,
             )
+            kickstarted = result.returncode == 0
+        except subprocess.TimeoutExpired:
+            kickstarted = False
+        if kickstarted:
             rumps.notification(
                 "Claude Code Slack", "", "Daemon restarted", sound=False
             )
-        except Exception:
-            plist_path = os.path.expanduser(
-                f"~/Library/LaunchAgents/{PLIST_LABEL}.plist"
-            )
-            subprocess.run(["launchctl", "unload", plist_path], capture_output=True)
-            subprocess.run(["launchctl", "load", plist_path], capture_output=True)
-            rumps.notification(
-                "Claude Code Slack", "", "Daemon restarted (fallback)", sound=False
-            )
+            return
+
+        plist_path = os.path.expanduser(
+            f"~/Library/LaunchAgents/{PLIST_LABEL}.plist"
+        )
+        subprocess.run(["launchctl", "unload", plist_path], capture_output=True)
+        subprocess.run(["launchctl", "load", plist_path], capture_output=True)
+        rumps.notification(
+            "Claude Code Slack", "", "Daemon restarted (fallback)", sound=False
+        )
 
     @rumps.clicked("View Logs")
     def view_logs(self, _):
@@ -22,6 +22,19 @@ class GitHubClient:
         self.token = token
         self.repo = repo
         self.branch = branch
+        # Conditional-request cache: url -> (etag, parsed body). GitHub
+        # answers unchanged files with a 304 — no body, no rate-limit cost.
+        self._etag_cache: dict[str, tuple[str, object]] = {}
+        # Shared keep-alive client — one TLS handshake for all API calls
+        self._client = httpx.AsyncClient(
+            http2=True,
+            timeout=30,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=40),
+        )
+
+    async def aclose(self):
+        """Close the underlying HTTP client."""
+        await self._client.aclose()
 
     def _headers(self) -> dict:
         h = {
@@ -32,29 +45,56 @@ class GitHubClient:
             h["Authorization"] = f"Bearer {self.token}"
         return h
 
+    async def _conditional_get(self, url: str, params: dict):
+        """GET with If-None-Match. Returns (status_code, parsed JSON).
+
+        A 304 is translated to (200, cached body) so callers never see it.
+        """
+        headers = self._headers()
+        cached = self._etag_cache.get(url)
+        if cached:
+            headers["If-None-Match"] = cached[0]
+
+        resp = await self._client.get(url, headers=headers, params=params)
+
+        if resp.status_code == 304 and cached:
+            return 200, cached[1]
+        if resp.status_code == 200:
+            data = resp.json()
+            etag = resp.headers.get("ETag")
+            if etag:
+                self._etag_cache[url] = (etag, data)
+            return 200, data
+        return resp.status_code, None
+
     async def read_file(self, path: str) -> str | None:
         """Read a file from the GitHub repo. Returns content or None."""
         url = f"{GITHUB_API}/repos/{self.repo}/contents/{path}"
         params = {"ref": self.branch}
 
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(url, headers=self._headers(), params=params)
+        status, data = await self._conditional_get(url, params)
 
-            if resp.status_code == 404:
-                return None
-            if resp.status_code != 200:
-                logger.error(f"GitHub read error {path}: {resp.status_code}")
-                return None
+        if status == 404:
+            return None
+        if status != 200:
+            logger.error(f"GitHub read error {path}: {status}")
+            return None
 
-            data = resp.json()
-            return base64.b64decode(data["content"]).decode("utf-8")
+        return base64.b64decode(data["content"]).decode("utf-8")
 
-    async def write_file(self, path: str, content: str, message: str) -> bool:
-        """Create or update a file. Returns True on success."""
+    async def write_file(
+        self, path: str, content: str, message: str, if_new_only: bool = False
+    ) -> bool:
+        """Create or update a file. Returns True on success.
+
+        if_new_only skips the SHA lookup round trip and submits a
+        create-only PUT — use it for freshly generated paths that cannot
+        exist yet. GitHub answers 422 if the path does exist.
+        """
         url = f"{GITHUB_API}/repos/{self.repo}/contents/{path}"
 
         # Get current SHA if file exists (required for updates)
-        sha = await self._get_file_sha(path)
+        sha = None if if_new_only else await self._get_file_sha(path)
 
         payload = {
             "message": message,
@@ -64,15 +104,14 @@ class GitHubClient:
         if sha:
             payload["sha"] = sha
 
-        async with httpx.AsyncClient() as client:
-            resp = await client.put(url, headers=self._headers(), json=payload)
+        resp = await self._client.put(url, headers=self._headers(), json=payload)
 
-            if resp.status_code in (200, 201):
-                logger.info(f"Wrote {path} to GitHub")
-                return True
+        if resp.status_code in (200, 201):
+            logger.info(f"Wrote {path} to GitHub")
+            return True
 
-            logger.error(f"GitHub write error {path}: {resp.status_code}")
-            return False
+        logger.error(f"GitHub write error {path}: {resp.status_code}")
+        return False
 
     async def delete_file(self, path: str, sha: str, message: str) -> bool:
         """Delete a file from the repo."""
@@ -83,19 +122,17 @@ class GitHubClient:
             "branch": self.branch,
         }
 
-        async with httpx.AsyncClient() as client:
-            resp = await client.request(
-                "DELETE", url, headers=self._headers(), json=payload
-            )
-            return resp.status_code in (200, 204)
+        resp = await self._client.request(
+            "DELETE", url, headers=self._headers(), json=payload
+        )
+        return resp.status_code in (200, 204)
 
     async def _get_file_sha(self, path: str) -> str | None:
         """Get the SHA of a file (needed for updates)."""
         url = f"{GITHUB_API}/repos/{self.repo}/contents/{path}"
         params = {"ref": self.branch}
 
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(url, headers=self._headers(), params=params)
-            if resp.status_code == 200:
-                return resp.json().get("sha")
-            return None
+        status, data = await self._conditional_get(url, params)
+        if status == 200 and data is not None:
+            return data.get("sha")
+        return None
@@ -7,17 +7,32 @@ Everything else is dispatched to the local daemon via the GitHub task queue.
 
 from __future__ import annotations
 
-import json
 import logging
 import uuid
 from datetime import datetime, timezone
 
 import httpx
+import orjson
 
 from github_client import GitHubClient
 
 logger = logging.getLogger("claude-code-slack.jobs")
 
+# Shared keep-alive HTTP client for Slack calls — one TLS handshake,
+# reused across requests (GitHub calls go through GitHubClient's own).
+_client: httpx.AsyncClient | None = None
+
+
+def get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=True,
+            timeout=30,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=40),
+        )
+    return _client
+
 
 class JobHandler:
     def __init__(self, github_client: GitHubClient, slack_bot_token: str = ""):
@@ -31,6 +46,7 @@ class JobHandler:
         channel_id: str = "",
         response_url: str = "",
         thread_ts: str = "",
+        is_thread_root: bool = False,
     ):
         """Route a request to the appropriate handler."""
         text_lower = text.lower().strip()
@@ -53,6 +69,7 @@ class JobHandler:
             channel_id=channel_id,
             response_url=response_url,
             thread_ts=thread_ts,
+            is_thread_root=is_thread_root,
         )
 
     async def _dispatch_to_daemon(
@@ -62,6 +79,7 @@ class JobHandler:
         channel_id: str,
         response_url: str = "",
         thread_ts: str = "",
+        is_thread_root: bool = False,
     ):
         """Write a task file to GitHub tasks/ directory for the daemon to pick up."""
         task_id = str(uuid.uuid4())[:8]
@@ -71,15 +89,32 @@ class JobHandler:
             "requested_by": user_id,
             "channel_id": channel_id,
             "thread_ts": thread_ts,
+            "is_thread_root": is_thread_root,
             "response_url": response_url,
             "created_at": datetime.now(timezone.utc).isoformat(),
         }
 
         task_path = f"tasks/{task_id}.json"
-        task_json = json.dumps(task, indent=2)
+        task_json = orjson.dumps(task, option=orjson.OPT_INDENT_2).decode()
         commit_msg = f"Task {task_id}: {text[:50]}"
 
-        success = await self.github.write_file(task_path, task_json, commit_msg)
+        # The task path is freshly generated, so skip the exists-check GET
+        success = await self.github.write_file(
+            task_path, task_json, commit_msg, if_new_only=True
+        )
+
+        if not success:
+            # Rare short-UUID collision (422) or transient error — retry
+            # once with a fresh id before reporting failure
+            task_id = str(uuid.uuid4())[:8]
+            task["task_id"] = task_id
+            task_path = f"tasks/{task_id}.json"
+            success = await self.github.write_file(
+                task_path,
+                orjson.dumps(task, option=orjson.OPT_INDENT_2).decode(),
+                f"Task {task_id}: {text[:50]}",
+                if_new_only=True,
+            )
 
         if success:
             logger.info(f"Dispatched task {task_id} to daemon")
@@ -110,21 +145,19 @@ class JobHandler:
     ):
         """Send a response back to Slack."""
         if response_url:
-            async with httpx.AsyncClient() as client:
-                await client.post(
-                    response_url,
-                    json={"response_type": "in_channel", "text": text},
-                )
+            await get_client().post(
+                response_url,
+                json={"response_type": "in_channel", "text": text},
+            )
         elif channel_id and self.slack_bot_token:
             payload = {"channel": channel_id, "text": text}
             if thread_ts:
                 payload["thread_ts"] = thread_ts
-            async with httpx.AsyncClient() as client:
-                resp = await client.post(
-                    "https://slack.com/api/chat.postMessage",
-                    headers={"Authorization": f"Bearer {self.slack_bot_token}"},
-                    json=payload,
-                )
-                data = resp.json()
-                if not data.get("ok"):
-                    logger.error(f"Slack error: {data.get('error')}")
+            resp = await get_client().post(
+                "https://slack.com/api/chat.postMessage",
+                headers={"Authorization": f"Bearer {self.slack_bot_token}"},
+                json=payload,
+            )
+            data = resp.json()
+            if not data.get("ok"):
+                logger.error(f"Slack error: {data.get('error')}")
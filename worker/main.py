@@ -10,76 +10,190 @@ Deploy to Railway (or any container host) with: python main.py
 from __future__ import annotations
 
 import asyncio
-import hashlib
 import hmac
-import json
 import logging
 import os
-import re
 import sys
 import time
 import traceback
+from collections import OrderedDict
 from contextlib import asynccontextmanager
+from urllib.parse import parse_qsl
 
-print(f"[startup] Python {sys.version}", flush=True)
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(name)s] %(levelname)s %(message)s",
+)
+logger = logging.getLogger("claude-code-slack.worker")
+
+logger.info("Python %s", sys.version)
 
 try:
+    import orjson
     from dotenv import load_dotenv
     from fastapi import FastAPI, Request, Response
+    from fastapi.responses import ORJSONResponse
 
     from github_client import GitHubClient
     from job_handler import JobHandler
 
-    print("[startup] All imports succeeded", flush=True)
+    logger.info("All imports succeeded")
 except Exception as e:
+    # Keep plain print here — if imports fail this early, stdout is the
+    # one channel guaranteed to reach the container logs
     print(f"[startup] IMPORT ERROR: {e}", flush=True)
     traceback.print_exc()
     sys.exit(1)
 
 load_dotenv()
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(name)s] %(levelname)s %(message)s",
-)
-logger = logging.getLogger("claude-code-slack.worker")
+def _strip_mentions(text: str) -> str:
+    """Remove <@USERID> mentions and the whitespace that follows them.
+
+    Runs on every DM/mention, so this scans with str.find (a C-level
+    search) instead of the regex engine — the pattern is dominated by
+    the literal "<@" prefix, making backtracking machinery pure overhead.
+    """
+    start = text.find("<@")
+    if start == -1:
+        return text  # fast path: no mentions at all
+
+    out = []
+    pos = 0
+    while True:
+        start = text.find("<@", pos)
+        if start == -1:
+            out.append(text[pos:])
+            break
+
+        end = text.find(">", start + 2)
+        body = text[start + 2 : end] if end != -1 else ""
+        if not body or not all("A" <= c <= "Z" or "0" <= c <= "9" for c in body):
+            # Not a mention token — keep the "<@" literally and move on
+            out.append(text[pos : start + 2])
+            pos = start + 2
+            continue
+
+        out.append(text[pos:start])
+        pos = end + 1
+        while pos < len(text) and text[pos].isspace():
+            pos += 1
+
+    return "".join(out)
+
 
 # --- Slack signature verification ---
 
 SLACK_SIGNING_SECRET = os.getenv("SLACK_SIGNING_SECRET", "")
+_SIGNING_SECRET_BYTES = SLACK_SIGNING_SECRET.encode()
+
+# Replay cache: valid signatures seen inside the timestamp window. The
+# window check alone lets a captured request be replayed for 5 minutes;
+# one dict lookup here closes that and skips the HMAC recompute.
+_SEEN_SIGS_MAX = 10_000
+_seen_sigs: OrderedDict = OrderedDict()
+
+
+def _record_signature(signature: str, now: int):
+    """Remember a verified signature, evicting expired/oldest entries."""
+    while _seen_sigs:
+        oldest_sig, seen_at = next(iter(_seen_sigs.items()))
+        if now - seen_at <= 300 and len(_seen_sigs) < _SEEN_SIGS_MAX:
+            break
+        _seen_sigs.pop(oldest_sig)
+    _seen_sigs[signature] = now
 
 
 def verify_slack_signature(body: bytes, timestamp: str, signature: str) -> bool:
     """Verify Slack request signature (v0 HMAC-SHA256)."""
-    if not SLACK_SIGNING_SECRET:
+    if not _SIGNING_SECRET_BYTES:
         logger.warning("SLACK_SIGNING_SECRET not set — skipping verification")
         return True
 
-    # Replay protection: reject requests older than 5 minutes
+    # Replay protection: reject requests older than 5 minutes. Slack
+    # timestamps are integer seconds, so int() avoids the float round trip
     try:
-        if abs(time.time() - float(timestamp)) > 300:
-            return False
+        ts = int(timestamp)
     except (ValueError, TypeError):
         return False
+    if abs(int(time.time()) - ts) > 300:
+        return False
 
-    base = f"v0:{timestamp}:{body.decode('utf-8')}"
-    expected = "v0=" + hmac.new(
-        SLACK_SIGNING_SECRET.encode(), base.encode(), hashlib.sha256
-    ).hexdigest()
+    # "v0=" plus 64 hex chars — anything else can't match, skip the HMAC.
+    # The prefix must be pinned explicitly: acceptance below only looks at
+    # the hex tail, while the replay cache keys on the full header, so a
+    # mutated prefix would otherwise sail past both.
+    if len(signature) != 67 or not signature.startswith("v0="):
+        return False
 
-    return hmac.compare_digest(expected, signature)
+    # A signature we already accepted inside the window is a replay
+    if signature in _seen_sigs:
+        return False
+
+    try:
+        provided = bytes.fromhex(signature[3:])  # strip "v0="
+    except ValueError:
+        return False
+
+    # Concatenate bytes directly — no decode/re-encode of the payload —
+    # and use the one-shot C implementation of HMAC (no object + hex step)
+    base = b"v0:" + timestamp.encode("ascii") + b":" + body
+    expected = hmac.digest(_SIGNING_SECRET_BYTES, base, "sha256")
+
+    if not hmac.compare_digest(expected, provided):
+        return False
+
+    _record_signature(signature, int(time.time()))
+    return True
 
 
 # --- App setup ---
 
 job_handler: JobHandler = None
 
+# Strong references to in-flight dispatches — asyncio keeps only a weak
+# ref to tasks, so an unreferenced one can be garbage-collected mid-run
+_background_tasks: set = set()
+
+
+def _spawn(coro) -> asyncio.Task:
+    """create_task that can't be GC'd and cleans up after itself."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+# Bounded event queue drained by a fixed worker pool — a channel-wide
+# mention storm queues up instead of spawning unbounded handler tasks
+_EVENT_QUEUE_MAX = 1000
+_EVENT_WORKERS = 8
+_event_queue: asyncio.Queue = None
+_event_workers: list = []
+
+
+async def _event_worker():
+    """Pull events off the queue and handle them, one at a time."""
+    while True:
+        event = await _event_queue.get()
+        try:
+            await handle_event(event)
+        except Exception:
+            logger.exception("Event handler failed")
+        finally:
+            _event_queue.task_done()
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global job_handler
+    global job_handler, _event_queue
     logger.info("Starting Claude Code Slack Worker...")
 
+    _event_queue = asyncio.Queue(maxsize=_EVENT_QUEUE_MAX)
+    _event_workers.extend(
+        asyncio.create_task(_event_worker()) for _ in range(_EVENT_WORKERS)
+    )
+
     github_client = GitHubClient(
         token=os.getenv("GITHUB_TOKEN", ""),
         repo=os.getenv("GITHUB_REPO", ""),
@@ -91,13 +205,28 @@ async def lifespan(app: FastAPI):
         slack_bot_token=os.getenv("SLACK_BOT_TOKEN", ""),
     )
 
-    logger.info(f"GitHub: repo={github_client.repo}")
+    logger.info("GitHub: repo=%s", github_client.repo)
     logger.info("Worker ready. Listening for Slack events.")
     yield
+    # Drain queued events, then stop the pool and in-flight dispatches
+    try:
+        await asyncio.wait_for(_event_queue.join(), timeout=30)
+    except asyncio.TimeoutError:
+        logger.warning("Event queue did not drain before shutdown")
+    for worker in _event_workers:
+        worker.cancel()
+    if _background_tasks:
+        logger.info("Draining %d in-flight dispatches...", len(_background_tasks))
+        await asyncio.wait(_background_tasks, timeout=30)
+    await github_client.aclose()
     logger.info("Shutting down.")
 
 
-app = FastAPI(title="Claude Code Slack Worker", lifespan=lifespan)
+app = FastAPI(
+    title="Claude Code Slack Worker",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 
 # --- Routes ---
@@ -108,10 +237,26 @@ async def health():
     return {"status": "healthy"}
 
 
+# Slack event payloads are well under 1 MB; anything bigger is hostile
+# or misconfigured and gets rejected before buffering/HMAC work
+_MAX_BODY_BYTES = 1_048_576
+
+
 @app.post("/slack/events")
 async def slack_events(request: Request):
     """Handle all Slack events: URL verification, slash commands, app mentions, DMs."""
-    body = await request.body()
+    # Cheap reject on the declared size, then stream with a hard cap
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > _MAX_BODY_BYTES:
+        return Response(content="Payload too large", status_code=413)
+
+    chunks = bytearray()
+    async for chunk in request.stream():
+        chunks.extend(chunk)
+        if len(chunks) > _MAX_BODY_BYTES:
+            return Response(content="Payload too large", status_code=413)
+    body = bytes(chunks)
+
     timestamp = request.headers.get("X-Slack-Request-Timestamp", "")
     signature = request.headers.get("X-Slack-Signature", "")
 
@@ -120,16 +265,23 @@ async def slack_events(request: Request):
 
     content_type = request.headers.get("content-type", "")
 
-    # Slack sends slash commands as form-encoded
+    # Slack sends slash commands as form-encoded; decode the body exactly
+    # once (the JSON path below parses the raw bytes directly)
     if "application/x-www-form-urlencoded" in content_type:
-        from urllib.parse import parse_qs
-
-        form = parse_qs(body.decode("utf-8"))
-        payload = {k: v[0] if len(v) == 1 else v for k, v in form.items()}
+        # Slash-command fields are single-valued, so parse_qsl gives the
+        # flat {k: v} mapping directly — no per-key list to unwrap
+        payload = dict(parse_qsl(body.decode("utf-8"), keep_blank_values=True))
         return await handle_slash_command(payload)
 
-    # Events API sends JSON
-    payload = json.loads(body)
+    # Bot-originated events (often half the traffic in busy workspaces)
+    # get discarded below anyway — a C-level bytes scan lets us skip the
+    # JSON parse for them. Worst case (marker appears inside message
+    # text) we ignore an event a bot loop would have ignored regardless.
+    if b'"bot_id":' in body or b'"subtype":"bot_message"' in body:
+        return {"ok": True}
+
+    # Events API sends JSON (orjson parses the raw bytes directly)
+    payload = orjson.loads(body)
 
     # URL verification challenge (Slack sends this during setup)
     if payload.get("type") == "url_verification":
@@ -142,12 +294,31 @@ async def slack_events(request: Request):
         if event.get("bot_id") or event.get("subtype") == "bot_message":
             return {"ok": True}
 
-        asyncio.create_task(handle_event(event))
+        try:
+            _event_queue.put_nowait(event)
+        except asyncio.QueueFull:
+            logger.warning("Event queue full — dropping event")
         return {"ok": True}
 
     return {"ok": True}
 
 
+# Slash-command ack, pre-encoded except for the user's text. Slack gives
+# us 3 seconds to answer, so the response path stays as flat as possible.
+_ACK_PREFIX = b'{"response_type":"ephemeral","text":'
+_ACK_SUFFIX = b"}"
+
+
+def _ack_response(text: str) -> Response:
+    # orjson.dumps on the string alone handles the JSON escaping
+    return Response(
+        content=_ACK_PREFIX
+        + orjson.dumps(f"Got it: `{text or 'help'}`\nWorking on it...")
+        + _ACK_SUFFIX,
+        media_type="application/json",
+    )
+
+
 async def handle_slash_command(payload: dict):
     """Handle slash command (e.g., /claude)."""
     text = (payload.get("text", "") or "").strip()
@@ -155,10 +326,10 @@ async def handle_slash_command(payload: dict):
     channel_id = payload.get("channel_id", "")
     response_url = payload.get("response_url", "")
 
-    logger.info(f"Slash command from {user_id}: '{text}'")
+    logger.info("Slash command from %s: '%s'", user_id, text)
 
     # Execute in background, respond immediately
-    asyncio.create_task(
+    _spawn(
         job_handler.dispatch(
             text=text,
             user_id=user_id,
@@ -167,13 +338,7 @@ async def handle_slash_command(payload: dict):
         )
     )
 
-    return Response(
-        content=json.dumps({
-            "response_type": "ephemeral",
-            "text": f"Got it: `{text or 'help'}`\nWorking on it...",
-        }),
-        media_type="application/json",
-    )
+    return _ack_response(text)
 
 
 async def handle_event(event: dict):
@@ -182,17 +347,21 @@ async def handle_event(event: dict):
     user_id = event.get("user", "unknown")
     channel_id = event.get("channel", "")
     thread_ts = event.get("thread_ts") or event.get("ts", "")
+    # No thread_ts on the event means this message starts its own thread,
+    # so there is no prior conversation for the daemon to fetch
+    is_thread_root = not event.get("thread_ts")
 
     # Strip bot mention prefix (e.g., "<@U123> do something" -> "do something")
-    text = re.sub(r"<@[A-Z0-9]+>\s*", "", text).strip()
+    text = _strip_mentions(text).strip()
 
-    logger.info(f"Event from {user_id} in {channel_id}: '{text[:60]}'")
+    logger.info("Event from %s in %s: '%s'", user_id, channel_id, text[:60])
 
     await job_handler.dispatch(
         text=text,
         user_id=user_id,
         channel_id=channel_id,
         thread_ts=thread_ts,
+        is_thread_root=is_thread_root,
     )
 
 
@@ -200,5 +369,14 @@ if __name__ == "__main__":
     import uvicorn
 
     port = int(os.getenv("PORT", 8080))
-    print(f"[startup] Starting uvicorn on port {port}", flush=True)
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    logger.info("Starting uvicorn on port %d", port)
+    # Request explicitly instead of relying on uvicorn's auto-detection;
+    # access_log is off since the worker does its own request logging
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=port,
+        loop="uvloop",
+        http="httptools",
+        access_log=False,
+    )